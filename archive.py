@@ -0,0 +1,412 @@
+"""
+Resume archive (.rma): many ResumeData records in one file with O(log n)
+random access by ID.
+
+Data file:   MAGIC | record*
+  record     = <u16 id_len><u32 payload_len> id(utf-8) payload
+  payload    = zlib(compact JSON of model_dump(exclude_defaults=True)),
+               always including schema_version
+
+Index file (<archive>.idx), memory-mapped and binary-searched:
+  INDEX_MAGIC <u64 data_size><u64 count> entry*
+  entry      = <u64 hash(id)><u64 record offset>, sorted by (hash, offset)
+
+data_size records how much of the data file the index covers; a stale or
+missing index is rebuilt by a sequential scan. A partial record left at the
+end by a killed writer is truncated away (with a warning) before that.
+Appending an ID that already exists shadows the earlier record; iteration
+and len() only see the latest record per ID.
+"""
+from __future__ import annotations
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import struct
+import tempfile
+import warnings
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from models import ResumeData
+from fileio import PathLike, atomic_open
+from migrations import parse_resume
+
+
+MAGIC = b"RMKA\x01\x00\x00\x00"
+INDEX_MAGIC = b"RMKI\x01\x00\x00\x00"
+_REC = struct.Struct("<HI")
+_IDX_HEAD = struct.Struct("<QQ")
+_ENTRY = struct.Struct("<QQ")
+_INDEX_HEAD = len(INDEX_MAGIC) + _IDX_HEAD.size
+_ENTRIES_PER_IO = 4096
+# Index entries sorted in memory at once by rebuild_index (~30 MB of tuples)
+_SORT_RUN = 1 << 18
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def _key(record_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(record_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def encode_resume(resume: ResumeData) -> bytes:
+    raw = resume.model_dump(exclude_defaults=True)
+    # Kept explicitly so old records still migrate after SCHEMA_VERSION moves
+    raw["schema_version"] = resume.schema_version
+    return zlib.compress(json.dumps(raw, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), 6)
+
+
+def decode_resume(payload: bytes) -> ResumeData:
+    return parse_resume(json.loads(zlib.decompress(payload)))
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx")
+
+
+def _scan(buf, start: int = len(MAGIC)) -> Iterator[Tuple[int, str, int, int]]:
+    """Yield (offset, id, payload_offset, payload_len) for each record."""
+    pos, end = start, len(buf)
+    while pos < end:
+        if pos + _REC.size > end:
+            raise ArchiveError(f"truncated record header at offset {pos}")
+        id_len, payload_len = _REC.unpack_from(buf, pos)
+        id_start = pos + _REC.size
+        payload_start = id_start + id_len
+        if payload_start + payload_len > end:
+            raise ArchiveError(f"truncated record at offset {pos}")
+        yield pos, bytes(buf[id_start:payload_start]).decode("utf-8"), payload_start, payload_len
+        pos = payload_start + payload_len
+
+
+def _complete_end(buf, pos: int) -> int:
+    """Offset just past the last complete record at or after `pos`."""
+    end = len(buf)
+    while pos + _REC.size <= end:
+        id_len, payload_len = _REC.unpack_from(buf, pos)
+        nxt = pos + _REC.size + id_len + payload_len
+        if nxt > end:
+            break
+        pos = nxt
+    return pos
+
+
+def _repair(path: Path):
+    """
+    Truncate a partial record left at the end of the data file by a writer
+    that was killed mid-append. Only the part not covered by the index is
+    scanned.
+    """
+    size = path.stat().st_size
+    head = _index_header(path)
+    start = head[0] if head is not None and len(MAGIC) <= head[0] <= size else len(MAGIC)
+    if start >= size:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        if buf[:len(MAGIC)] != MAGIC:
+            raise ArchiveError(f"{path} is not a resume archive")
+        end = _complete_end(buf, start)
+    if end < size:
+        warnings.warn(f"{path}: dropping {size - end} bytes of an incomplete record at offset {end}")
+        os.truncate(path, end)
+
+
+def _write_index(path: Path, data_size: int, count: int, entries: Iterable[Tuple[int, int]]):
+    """Stream `count` already-sorted entries into a new index file."""
+    with atomic_open(_index_path(path)) as f:
+        f.write(INDEX_MAGIC + _IDX_HEAD.pack(data_size, count))
+        buf = bytearray()
+        for key, offset in entries:
+            buf += _ENTRY.pack(key, offset)
+            if len(buf) >= _ENTRIES_PER_IO * _ENTRY.size:
+                f.write(buf)
+                buf.clear()
+        f.write(buf)
+
+
+def _iter_index_entries(f: BinaryIO, start: int = _INDEX_HEAD) -> Iterator[Tuple[int, int]]:
+    f.seek(start)
+    while True:
+        chunk = f.read(_ENTRIES_PER_IO * _ENTRY.size)
+        if not chunk:
+            return
+        yield from _ENTRY.iter_unpack(chunk)
+
+
+def _index_header(path: Path) -> Optional[Tuple[int, int]]:
+    """(data_size, count) of a well-formed index file, else None. Entries are not read."""
+    try:
+        with open(_index_path(path), "rb") as f:
+            raw = f.read(_INDEX_HEAD)
+            f.seek(0, 2)
+            length = f.tell()
+    except OSError:
+        return None
+    if len(raw) < _INDEX_HEAD or raw[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+        return None
+    covered, count = _IDX_HEAD.unpack_from(raw, len(INDEX_MAGIC))
+    if length != _INDEX_HEAD + count * _ENTRY.size:
+        return None
+    return covered, count
+
+
+def _index_covers(path: Path, data_size: int) -> bool:
+    head = _index_header(path)
+    return head is not None and head[0] == data_size
+
+
+def _spill(run: List[Tuple[int, int]]) -> BinaryIO:
+    run.sort()
+    f = tempfile.TemporaryFile()
+    for i in range(0, len(run), _ENTRIES_PER_IO):
+        f.write(b"".join(_ENTRY.pack(*e) for e in run[i:i + _ENTRIES_PER_IO]))
+    return f
+
+
+def rebuild_index(path: PathLike):
+    """
+    Re-index the data file from a memory-mapped scan. Entries are sorted in
+    runs of _SORT_RUN spilled to temp files and merged, so memory does not
+    grow with the archive.
+    """
+    path = Path(path)
+    _repair(path)
+    runs: List[BinaryIO] = []
+    run: List[Tuple[int, int]] = []
+    count = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        if buf[:len(MAGIC)] != MAGIC:
+            raise ArchiveError(f"{path} is not a resume archive")
+        for off, rid, _, _ in _scan(buf):
+            run.append((_key(rid), off))
+            count += 1
+            if len(run) >= _SORT_RUN:
+                runs.append(_spill(run))
+                run = []
+        size = len(buf)
+    try:
+        if not runs:
+            run.sort()
+            _write_index(path, size, count, run)
+            return
+        runs.append(_spill(run))
+        del run
+        _write_index(path, size, count, heapq.merge(*(_iter_index_entries(r, 0) for r in runs)))
+    finally:
+        for r in runs:
+            r.close()
+
+
+class ArchiveWriter:
+    """
+    Streaming appender. Records go straight to disk; only the 16-byte index
+    entries of new records are held in memory until close(), which merges
+    them into the existing index without loading it. Leaving the `with`
+    block on an exception discards everything appended in this session.
+    """
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        exists = self.path.exists() and self.path.stat().st_size > 0
+        if exists:
+            with open(self.path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ArchiveError(f"{self.path} is not a resume archive")
+            _repair(self.path)
+        self._f = open(self.path, "ab")
+        if not exists:
+            self._f.write(MAGIC)
+        self._start_size = self._f.tell()
+        self._new: List[Tuple[int, int]] = []
+
+    def append(self, record_id: str, resume: ResumeData):
+        rid = record_id.encode("utf-8")
+        if len(rid) > 0xFFFF:
+            raise ArchiveError("record id too long")
+        payload = encode_resume(resume)
+        offset = self._f.tell()
+        self._f.write(_REC.pack(len(rid), len(payload)) + rid + payload)
+        self._new.append((_key(record_id), offset))
+
+    def close(self):
+        if self._f.closed:
+            return
+        self._f.close()
+        size = self.path.stat().st_size
+        if not _index_covers(self.path, self._start_size):
+            rebuild_index(self.path)
+            return
+        self._new.sort()
+        old_count = _index_header(self.path)[1]
+        with open(_index_path(self.path), "rb") as old:
+            merged = heapq.merge(_iter_index_entries(old), self._new)
+            _write_index(self.path, size, old_count + len(self._new), merged)
+
+    def abort(self):
+        """Drop the records appended in this session; the index is untouched."""
+        if self._f.closed:
+            return
+        self._f.truncate(self._start_size)
+        self._f.close()
+        self._new = []
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ResumeArchive:
+    """
+    Read-only, memory-mapped view of an archive. get() touches one index
+    probe path and one record; nothing else is parsed.
+    """
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        if not _index_covers(self.path, self.path.stat().st_size):
+            _repair(self.path)
+            if not _index_covers(self.path, self.path.stat().st_size):
+                rebuild_index(self.path)
+        self._data_f = open(self.path, "rb")
+        self._idx_f = open(_index_path(self.path), "rb")
+        self._data = mmap.mmap(self._data_f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._idx = mmap.mmap(self._idx_f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ArchiveError(f"{self.path} is not a resume archive")
+        self._entries_at = _INDEX_HEAD
+        _, self._count = _IDX_HEAD.unpack_from(self._idx, len(INDEX_MAGIC))
+        self._live_count: Optional[int] = None
+
+    def _entry(self, i: int) -> Tuple[int, int]:
+        return _ENTRY.unpack_from(self._idx, self._entries_at + i * _ENTRY.size)
+
+    def _record(self, offset: int) -> Tuple[str, bytes]:
+        id_len, payload_len = _REC.unpack_from(self._data, offset)
+        id_start = offset + _REC.size
+        payload_start = id_start + id_len
+        rid = self._data[id_start:payload_start].decode("utf-8")
+        return rid, self._data[payload_start:payload_start + payload_len]
+
+    def _find(self, record_id: str) -> Optional[int]:
+        key = _key(record_id)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = None
+        # Equal hashes are ordered by offset, so the last match is the newest
+        while lo < self._count:
+            k, offset = self._entry(lo)
+            if k != key:
+                break
+            if self._record(offset)[0] == record_id:
+                found = offset
+            lo += 1
+        return found
+
+    def get(self, record_id: str) -> ResumeData:
+        offset = self._find(record_id)
+        if offset is None:
+            raise KeyError(record_id)
+        return decode_resume(self._record(offset)[1])
+
+    def __contains__(self, record_id: str) -> bool:
+        return self._find(record_id) is not None
+
+    def __len__(self) -> int:
+        """Number of distinct IDs (shadowed records are not counted)."""
+        if self._live_count is None:
+            # Entries are sorted by hash, so every copy of an ID is in one run
+            count, i = 0, 0
+            while i < self._count:
+                key = self._entry(i)[0]
+                j = i + 1
+                while j < self._count and self._entry(j)[0] == key:
+                    j += 1
+                if j - i == 1:
+                    count += 1
+                else:
+                    count += len({self._record(self._entry(n)[1])[0] for n in range(i, j)})
+                i = j
+            self._live_count = count
+        return self._live_count
+
+    def __iter__(self) -> Iterator[Tuple[str, ResumeData]]:
+        """The latest record for each ID, in file order."""
+        for offset, rid, start, length in _scan(self._data):
+            if self._find(rid) == offset:
+                yield rid, decode_resume(self._data[start:start + length])
+
+    def iter_all(self) -> Iterator[Tuple[str, ResumeData]]:
+        """Every record in file order, including ones shadowed by a later append."""
+        for _, rid, start, length in _scan(self._data):
+            yield rid, decode_resume(self._data[start:start + length])
+
+    def close(self):
+        for m in (getattr(self, "_data", None), getattr(self, "_idx", None)):
+            if m is not None and not m.closed:
+                m.close()
+        self._data_f.close()
+        self._idx_f.close()
+
+    def __enter__(self) -> "ResumeArchive":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def jsonl_to_archive(
+    src: PathLike,
+    dst: PathLike,
+    id_field: str = "id",
+    on_error: Optional[Callable[[str], None]] = None,
+) -> int:
+    """
+    Append every line of a JSONL file to an archive. The record ID comes from
+    `id_field` (falling back to <file stem>-<line number>, as in batch.py).
+    Lines that are not valid resumes are passed to `on_error` and skipped.
+    Returns the number of records appended.
+    """
+    src = Path(src)
+    n = 0
+    with open(src, "r", encoding="utf-8") as f, ArchiveWriter(dst) as w:
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record_id = f"{src.stem}-{lineno}"
+            try:
+                raw = json.loads(line)
+                if isinstance(raw, dict):
+                    record_id = str(raw.pop(id_field, record_id))
+                resume = parse_resume(raw)
+            except ValueError as e:
+                if on_error:
+                    on_error(f"{src.name}:{lineno}: {type(e).__name__}: {e}")
+                continue
+            w.append(record_id, resume)
+            n += 1
+    return n
+
+
+def archive_to_jsonl(src: PathLike, dst: PathLike, id_field: str = "id") -> int:
+    """Write the latest record for each ID as JSONL. Returns the record count."""
+    n = 0
+    with ResumeArchive(src) as a, open(dst, "w", encoding="utf-8") as f:
+        for record_id, resume in a:
+            f.write(json.dumps({id_field: record_id, **resume.model_dump()}, ensure_ascii=False))
+            f.write("\n")
+            n += 1
+    return n
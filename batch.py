@@ -0,0 +1,214 @@
+from __future__ import annotations
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple
+
+from fileio import iter_resume_files
+from lint import lint_files, MAX_BULLET_CHARS, MAX_VERB_REPEATS
+from watch import ResumeWatcher
+from archive import ResumeArchive, archive_to_jsonl, jsonl_to_archive
+from bundle import write_bundle
+from bulk_migrate import migrate_files, migrate_jsonl
+from dedup import DEFAULT_THRESHOLD, find_duplicates
+
+
+def iter_sources(paths: List[str], id_field: str = "id") -> Iterator[Tuple[str, Any]]:
+    """
+    (name, source) pairs from JSON files/directories, .jsonl files and .rma
+    archives. Sources are left unvalidated where possible (see
+    fileio.as_resume) so bad records fail per job instead of aborting.
+    """
+    for p in map(Path, paths):
+        if p.suffix == ".rma":
+            with ResumeArchive(p) as a:
+                yield from a
+        elif p.suffix == ".jsonl":
+            with open(p, "r", encoding="utf-8") as f:
+                for lineno, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        raw = json.loads(line)
+                    except ValueError:
+                        raw = None
+                    if not isinstance(raw, dict):
+                        yield f"{p.stem}-{lineno}", line
+                        continue
+                    yield str(raw.pop(id_field, f"{p.stem}-{lineno}")), raw
+        else:
+            for f in iter_resume_files([p]):
+                yield f.stem, f
+
+
+def _where(issue) -> str:
+    if issue.index is None:
+        return f"{issue.section}.{issue.field}"
+    return f"{issue.section}[{issue.index}].{issue.field}"
+
+
+def cmd_lint(args) -> int:
+    paths = list(iter_resume_files(args.paths))
+    failed = False
+    for path, issues, error in lint_files(
+        paths, jobs=args.jobs,
+        max_bullet_chars=args.max_bullet_chars, max_verb_repeats=args.max_verb_repeats,
+    ):
+        if error:
+            failed = True
+            print(f"{path}: error: {error}")
+            continue
+        for issue in issues:
+            failed = True
+            print(f"{path}: {_where(issue)}: [{issue.rule}] {issue.message}")
+    return 1 if failed else 0
+
+
+def cmd_watch(args) -> int:
+    ResumeWatcher(args.src, args.out, settle=args.settle, pdf=not args.no_pdf).run(args.interval)
+    return 0
+
+
+def cmd_archive(args) -> int:
+    if args.action == "pack":
+        errors = []
+
+        def on_error(msg: str):
+            errors.append(msg)
+            print(f"error: {msg}", file=sys.stderr)
+
+        n = jsonl_to_archive(args.src, args.dst, id_field=args.id_field, on_error=on_error)
+        print(f"Appended {n} records to {args.dst} ({len(errors)} skipped)")
+        return 1 if errors else 0
+    elif args.action == "unpack":
+        n = archive_to_jsonl(args.src, args.dst, id_field=args.id_field)
+        print(f"Wrote {n} records to {args.dst}")
+    else:
+        with ResumeArchive(args.src) as a:
+            try:
+                print(a.get(args.id).model_dump_json(indent=2))
+            except KeyError:
+                print(f"{args.id}: not found", file=sys.stderr)
+                return 1
+    return 0
+
+
+def cmd_bundle(args) -> int:
+    sources = iter_sources(args.paths, id_field=args.id_field)
+    opts = dict(workers=args.jobs, pdf=not args.no_pdf, dedup=args.dedup, threshold=args.threshold)
+    if args.out == "-":
+        written, failed, dups = write_bundle(sources, sys.stdout.buffer, **opts)
+    else:
+        with open(args.out, "wb") as out:
+            written, failed, dups = write_bundle(sources, out, **opts)
+    print(f"Bundled {written} resumes ({failed} failed, {dups} duplicates not rendered)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def cmd_migrate(args) -> int:
+    def on_error(msg: str):
+        print(f"error: {msg}", file=sys.stderr)
+
+    failed = False
+    for p in map(Path, args.paths):
+        if p.suffix == ".jsonl":
+            dst = Path(args.out) / p.name if args.out else None
+            report = migrate_jsonl(p, dst, dry_run=args.dry_run, jobs=args.jobs, id_field=args.id_field, on_error=on_error)
+        else:
+            report = migrate_files(iter_resume_files([p]), args.out, dry_run=args.dry_run, jobs=args.jobs, on_error=on_error)
+        failed = failed or report.failed > 0
+        print(
+            f"{p}: {report.total} records, {report.upgraded} upgraded, {report.current} already current, "
+            f"{report.failed} failed in {report.seconds:.2f}s ({report.records_per_second:,.0f} records/s)"
+            + (" [dry run]" if args.dry_run else "")
+        )
+    return 1 if failed else 0
+
+
+def cmd_dedup(args) -> int:
+    def on_error(msg: str):
+        print(f"error: {msg}", file=sys.stderr)
+
+    found = 0
+    sources = iter_sources(args.paths, id_field=args.id_field)
+    for dup in find_duplicates(sources, threshold=args.threshold, jobs=args.jobs, on_error=on_error):
+        found += 1
+        if dup.kind == "exact":
+            print(f"{dup.key}: exact duplicate of {dup.of}")
+        else:
+            print(f"{dup.key}: near duplicate of {dup.of} ({dup.similarity:.2f})")
+    print(f"{found} duplicates", file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="batch.py", description="Batch tools for resume JSON files.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("lint", help="Check resume JSON files for common problems.")
+    p.add_argument("paths", nargs="+", help="Resume JSON files or directories of them.")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    p.add_argument("--max-bullet-chars", type=int, default=MAX_BULLET_CHARS)
+    p.add_argument("--max-verb-repeats", type=int, default=MAX_VERB_REPEATS)
+    p.set_defaults(func=cmd_lint)
+
+    p = sub.add_parser("watch", help="Re-render .tex/.pdf whenever a resume JSON file changes.")
+    p.add_argument("src", help="Directory of resume JSON files.")
+    p.add_argument("-o", "--out", default=None, help="Output directory (default: same as src).")
+    p.add_argument("--interval", type=float, default=0.5, help="Seconds between scans.")
+    p.add_argument("--settle", type=float, default=0.5, help="Seconds a file must be unchanged before rendering.")
+    p.add_argument("--no-pdf", action="store_true", help="Only write .tex files.")
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("archive", help="Convert between JSONL and the binary resume archive (.rma).")
+    asub = p.add_subparsers(dest="action", required=True)
+    a = asub.add_parser("pack", help="Append a JSONL file to an archive.")
+    a.add_argument("src", help="Input .jsonl")
+    a.add_argument("dst", help="Archive (.rma), created if missing")
+    a.add_argument("--id-field", default="id")
+    a = asub.add_parser("unpack", help="Write an archive out as JSONL.")
+    a.add_argument("src", help="Archive (.rma)")
+    a.add_argument("dst", help="Output .jsonl")
+    a.add_argument("--id-field", default="id")
+    a = asub.add_parser("get", help="Print one resume by ID.")
+    a.add_argument("src", help="Archive (.rma)")
+    a.add_argument("id")
+    p.set_defaults(func=cmd_archive)
+
+    p = sub.add_parser("bundle", help="Render resumes and stream .tex/.pdf/.json into one ZIP.")
+    p.add_argument("paths", nargs="+", help="JSON files/directories, .jsonl files or .rma archives.")
+    p.add_argument("-o", "--out", required=True, help="Output .zip, or - for stdout.")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    p.add_argument("--no-pdf", action="store_true", help="Skip PDF builds.")
+    p.add_argument("--id-field", default="id", help="Name field in .jsonl records.")
+    p.add_argument("--dedup", choices=["reuse", "skip"], default=None,
+                   help="reuse: don't re-render exact duplicates; skip: also drop near duplicates.")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Near-duplicate similarity (0-1).")
+    p.set_defaults(func=cmd_bundle)
+
+    p = sub.add_parser("dedup", help="Report exact and near-duplicate resumes.")
+    p.add_argument("paths", nargs="+", help="JSON files/directories, .jsonl files or .rma archives.")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Near-duplicate similarity (0-1).")
+    p.add_argument("--id-field", default="id", help="Name field in .jsonl records.")
+    p.set_defaults(func=cmd_dedup)
+
+    p = sub.add_parser("migrate", help="Upgrade resume JSON/JSONL files to the current schema version.")
+    p.add_argument("paths", nargs="+", help="JSON files/directories or .jsonl files.")
+    p.add_argument("-o", "--out", default=None, help="Output directory (default: rewrite in place).")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    p.add_argument("--dry-run", action="store_true", help="Validate and report throughput without writing.")
+    p.add_argument("--id-field", default="id", help="ID field preserved in .jsonl records.")
+    p.set_defaults(func=cmd_migrate)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+from __future__ import annotations
+import io
+import json
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from models import ResumeData, SCHEMA_VERSION
+from migrations import UNVERSIONED, upgrade
+from fileio import atomic_open, atomic_write_text
+from parallel import chunks, run_ordered
+
+MAX_REPORTED_ERRORS = 100
+
+# (where, output text or None, was upgraded, error)
+_Outcome = Tuple[str, Optional[str], bool, Optional[str]]
+
+
+class MigrationReport(BaseModel):
+    total: int = 0
+    upgraded: int = 0
+    current: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    errors: List[str] = Field(default_factory=list)  # first MAX_REPORTED_ERRORS only
+
+    @property
+    def records_per_second(self) -> float:
+        return self.total / self.seconds if self.seconds else 0.0
+
+    def add(self, where: str, upgraded: bool, error: Optional[str]):
+        self.total += 1
+        if error:
+            self.failed += 1
+            if len(self.errors) < MAX_REPORTED_ERRORS:
+                self.errors.append(f"{where}: {error}")
+        elif upgraded:
+            self.upgraded += 1
+        else:
+            self.current += 1
+
+
+def _migrate_raw(raw) -> Tuple[Optional[dict], bool, Optional[str]]:
+    """
+    Upgraded document, or None on error. Top-level keys the models don't
+    know (e.g. bookkeeping added by other tools) are carried over as-is.
+    """
+    before = raw.get("schema_version", UNVERSIONED) if isinstance(raw, dict) else None
+    try:
+        raw = upgrade(raw)
+        resume = ResumeData.model_validate(raw)
+    except Exception as e:
+        return (None, False, f"{type(e).__name__}: {e}")
+    extra = {k: v for k, v in raw.items() if k not in ResumeData.model_fields}
+    return ({**resume.model_dump(), **extra}, before != SCHEMA_VERSION, None)
+
+
+def _migrate_lines(chunk: List[Tuple[str, str]], id_field: str) -> List[_Outcome]:
+    # Lines that fail are passed through unchanged so nothing is lost
+    out = []
+    for where, line in chunk:
+        original = line.rstrip("\r\n")
+        try:
+            raw = json.loads(line)
+        except ValueError as e:
+            out.append((where, original, False, f"{type(e).__name__}: {e}"))
+            continue
+        record_id = raw.pop(id_field, None) if isinstance(raw, dict) else None
+        doc, upgraded, error = _migrate_raw(raw)
+        if doc is None:
+            out.append((where, original, False, error))
+            continue
+        if record_id is not None:
+            doc = {id_field: record_id, **doc}
+        out.append((where, json.dumps(doc, ensure_ascii=False), upgraded, None))
+    return out
+
+
+def _migrate_files(chunk: List[Tuple[str, str]], dry_run: bool) -> List[_Outcome]:
+    out = []
+    for src, dst in chunk:
+        try:
+            raw = json.loads(Path(src).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            out.append((src, None, False, f"{type(e).__name__}: {e}"))
+            continue
+        doc, upgraded, error = _migrate_raw(raw)
+        if doc is not None and not dry_run and (upgraded or dst != src):
+            # Same layout as the editor's "Export JSON"
+            atomic_write_text(dst, json.dumps(doc, indent=2, ensure_ascii=False))
+        out.append((src, None, upgraded, error))
+    return out
+
+
+def migrate_jsonl(
+    src,
+    dst=None,
+    dry_run: bool = False,
+    jobs: Optional[int] = None,
+    id_field: str = "id",
+    chunk_size: int = 500,
+    on_error: Optional[Callable[[str], None]] = None,
+) -> MigrationReport:
+    """
+    Upgrade every line of a JSONL file, writing to `dst` (default: replace
+    `src` atomically). Failed records are reported and copied to the output
+    unchanged, so an in-place run never loses data. With dry_run nothing is
+    written.
+    """
+    src = Path(src)
+    dst = Path(dst) if dst else src
+    report = MigrationReport()
+    started = time.perf_counter()
+    with (nullcontext() if dry_run else atomic_open(dst)) as raw_out, open(src, "r", encoding="utf-8") as f:
+        out = io.TextIOWrapper(raw_out, encoding="utf-8") if raw_out is not None else None
+        lines = ((f"{src.name}:{n}", line) for n, line in enumerate(f, start=1) if line.strip())
+        for where, text, upgraded, error in run_ordered(_migrate_lines, chunks(lines, chunk_size), jobs, id_field):
+            report.add(where, upgraded, error)
+            if error and on_error:
+                on_error(f"{where}: {error}")
+            if out is not None and text is not None:
+                out.write(text + "\n")
+        if out is not None:
+            out.detach()  # flushes; atomic_open owns the underlying file
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def migrate_files(
+    paths: Iterable[Path],
+    out_dir=None,
+    dry_run: bool = False,
+    jobs: Optional[int] = None,
+    chunk_size: int = 50,
+    on_error: Optional[Callable[[str], None]] = None,
+) -> MigrationReport:
+    """
+    Upgrade resume JSON files in place (atomically), or into `out_dir`.
+    Files already at SCHEMA_VERSION are not rewritten in place.
+    """
+    report = MigrationReport()
+    started = time.perf_counter()
+    pairs = ((str(p), str(Path(out_dir) / Path(p).name) if out_dir else str(p)) for p in paths)
+    for where, _, upgraded, error in run_ordered(_migrate_files, chunks(pairs, chunk_size), jobs, dry_run):
+        report.add(where, upgraded, error)
+        if error and on_error:
+            on_error(f"{where}: {error}")
+    report.seconds = time.perf_counter() - started
+    return report
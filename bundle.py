@@ -0,0 +1,267 @@
+from __future__ import annotations
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, BinaryIO, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from latex import render_latex
+from pdf_export import build_pdf
+from fileio import as_resume
+from dedup import DEFAULT_THRESHOLD, DedupIndex, Duplicate, Sketch, sketch
+
+MANIFEST_NAME = "manifest.jsonl"
+MAX_NAME_CHARS = 120
+
+# Path separators, drive colons, control and shell-hostile characters
+_UNSAFE_NAME = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+
+def render_job(name: str, source: Any, pdf: bool = True) -> Dict:
+    """
+    Render one resume to .tex/.pdf/.json. `source` is anything
+    fileio.as_resume accepts. Runs in a worker process; errors are
+    returned in the result rather than raised.
+    """
+    result: Dict = {"name": name, "files": {}, "timings": {}, "error": None}
+    t0 = time.perf_counter()
+    try:
+        resume = as_resume(source)
+        result["files"]["json"] = resume.model_dump_json(indent=2).encode("utf-8")
+        t = time.perf_counter()
+        latex_src = render_latex(resume)
+        result["files"]["tex"] = latex_src.encode("utf-8")
+        result["timings"]["latex"] = round(time.perf_counter() - t, 4)
+        if pdf:
+            t = time.perf_counter()
+            pdf_bytes, engine, _ = build_pdf(resume, latex_src)
+            result["files"]["pdf"] = pdf_bytes
+            result["timings"]["pdf"] = round(time.perf_counter() - t, 4)
+            result["pdf_engine"] = engine
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["timings"]["total"] = round(time.perf_counter() - t0, 4)
+    return result
+
+
+def prepare_job(source: Any) -> Tuple[Any, Sketch]:
+    """Parse and sketch one job in a worker; the parsed resume is reused for rendering."""
+    resume = as_resume(source)
+    return resume, sketch(resume)
+
+
+class BundleWriter:
+    """
+    Streams rendered resumes into a ZIP as they finish. Works on
+    non-seekable outputs (e.g. stdout or an HTTP response). PDFs are
+    stored as-is since they are already compressed; .tex/.json are
+    deflated. Manifest lines are spooled to a temp file and appended as
+    manifest.jsonl on close, so memory use does not grow with the bundle.
+    """
+    def __init__(self, out: BinaryIO):
+        self._zip = zipfile.ZipFile(out, "w", allowZip64=True)
+        self._manifest = tempfile.TemporaryFile(mode="w+b")
+        self._names: Set[str] = set()
+        self._renamed: Dict[str, str] = {}  # entry name -> original ID, when they differ
+        self.written = 0
+        self.failed = 0
+        self.duplicates = 0
+
+    def reserve(self, name: str) -> str:
+        """
+        Claim a unique entry name (done at submit time, so duplicates can
+        refer to it). Names come from untrusted record IDs, so anything that
+        could escape the extraction directory is replaced.
+        """
+        base = _UNSAFE_NAME.sub("_", name)
+        base = re.sub(r"\.{2,}", ".", base).strip(" .")[:MAX_NAME_CHARS] or f"resume-{len(self._names) + 1}"
+        candidate, n = base, 1
+        while candidate in self._names:
+            n += 1
+            candidate = f"{base}-{n}"
+        self._names.add(candidate)
+        if candidate != name:
+            self._renamed[candidate] = name
+        return candidate
+
+    def _record(self, entry: Dict):
+        if entry["name"] in self._renamed:
+            entry["id"] = self._renamed[entry["name"]]
+        self._manifest.write(json.dumps(entry).encode("utf-8") + b"\n")
+
+    def add(self, result: Dict, extra: Optional[Dict] = None):
+        name = result["name"]
+        entry = {
+            "name": name,
+            "files": [],
+            "timings": result["timings"],
+            "error": result["error"],
+        }
+        if result.get("pdf_engine"):
+            entry["pdf_engine"] = result["pdf_engine"]
+        if extra:
+            entry.update(extra)
+        if result["error"] is None:
+            stamp = time.localtime()[:6]
+            for ext, data in result["files"].items():
+                info = zipfile.ZipInfo(f"{name}.{ext}", date_time=stamp)
+                info.compress_type = zipfile.ZIP_STORED if ext == "pdf" else zipfile.ZIP_DEFLATED
+                self._zip.writestr(info, data)
+                entry["files"].append(info.filename)
+            self.written += 1
+        else:
+            self.failed += 1
+        self._record(entry)
+
+    def add_duplicate(self, name: str, dup: Duplicate, action: str, of_failed: bool = False):
+        """
+        Manifest-only entry for a job that was not rendered. If its
+        representative failed to render there is nothing to point at, so the
+        entry is recorded as failed instead.
+        """
+        entry = {
+            "name": name,
+            "files": [],
+            "timings": {},
+            "error": f"duplicate of {dup.of}, which failed to render" if of_failed else None,
+            "action": action,
+            "duplicate_of": dup.of,
+            "duplicate_kind": dup.kind,
+            "similarity": dup.similarity,
+        }
+        if of_failed:
+            self.failed += 1
+        else:
+            self.duplicates += 1
+        self._record(entry)
+
+    def close(self, error: Optional[str] = None):
+        """
+        Append the manifest and finish the ZIP. With `error` (the bundle was
+        cut short) the manifest ends with an {"incomplete": true} line, so
+        consumers can tell a partial bundle from a complete one.
+        """
+        if error is not None:
+            self._manifest.write(json.dumps({"incomplete": True, "error": error}).encode("utf-8") + b"\n")
+        self._manifest.seek(0)
+        info = zipfile.ZipInfo(MANIFEST_NAME, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with self._zip.open(info, "w", force_zip64=True) as dst:
+            shutil.copyfileobj(self._manifest, dst)
+        self._manifest.close()
+        self._zip.close()
+
+    def __enter__(self) -> "BundleWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        try:
+            self.close(f"{exc_type.__name__}: {exc}")
+        except Exception:
+            pass  # the output may be what failed; keep the original error
+
+
+def write_bundle(
+    jobs: Iterable[Tuple[str, Any]],
+    out: BinaryIO,
+    workers: Optional[int] = None,
+    pdf: bool = True,
+    max_in_flight: Optional[int] = None,
+    dedup: Optional[str] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Tuple[int, int, int]:
+    """
+    Render (name, source) jobs across processes and stream each result into
+    a ZIP on `out` as soon as it completes (completion order, not input
+    order). At most `max_in_flight` jobs are pending at once, which bounds
+    memory.
+
+    dedup="reuse": exact duplicates (after normalization) are not rendered;
+    their manifest entry points at the first copy. Near duplicates are still
+    rendered, with duplicate_of in their manifest entry.
+    dedup="skip": exact and near duplicates are both left out.
+    Parsing and sketching run in the pool as well; the parent only does the
+    index lookups, in input order. A duplicate's manifest entry is written
+    once its representative has finished; if that render failed, the
+    duplicate is reported as failed.
+
+    Returns (written, failed, duplicates not rendered).
+    """
+    if dedup not in (None, "reuse", "skip"):
+        raise ValueError(f"unknown dedup mode {dedup!r}")
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 2
+    index = DedupIndex(threshold=threshold) if dedup else None
+    jobs = iter(jobs)
+    failed_reps: Set[str] = set()
+    waiting: Dict[str, List[Tuple[str, Duplicate, str]]] = {}  # in-flight representative -> its duplicates
+    with BundleWriter(out) as bundle, ProcessPoolExecutor(max_workers=workers) as pool:
+        sketching: Deque[Tuple[str, Future]] = deque()  # input order, so the first copy is the representative
+        pending: Dict = {}  # render future -> (name, extra manifest fields)
+        in_flight: Set[str] = set()
+
+        def submit(name: str, source: Any, extra: Optional[Dict]):
+            pending[pool.submit(render_job, name, source, pdf)] = (name, extra)
+            in_flight.add(name)
+
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) + len(sketching) < max_in_flight:
+                job = next(jobs, None)
+                if job is None:
+                    exhausted = True
+                    break
+                name = bundle.reserve(job[0])
+                if index is None:
+                    submit(name, job[1], None)
+                else:
+                    sketching.append((name, pool.submit(prepare_job, job[1])))
+
+            while sketching and sketching[0][1].done():
+                name, fut = sketching.popleft()
+                try:
+                    resume, sk = fut.result()
+                except Exception as e:
+                    bundle.add({"name": name, "files": {}, "timings": {}, "error": f"{type(e).__name__}: {e}"})
+                    continue
+                dup = index.add_sketch(name, *sk)
+                extra = None
+                if dup is not None:
+                    if dedup == "skip" or dup.kind == "exact":
+                        action = "skipped" if dedup == "skip" else "reused"
+                        if dup.of in in_flight:
+                            waiting.setdefault(dup.of, []).append((name, dup, action))
+                        else:
+                            bundle.add_duplicate(name, dup, action, dup.of in failed_reps)
+                        continue
+                    extra = {"duplicate_of": dup.of, "duplicate_kind": dup.kind, "similarity": dup.similarity}
+                submit(name, resume, extra)
+
+            if not pending and not sketching:
+                if exhausted:
+                    break
+                continue
+            waiting_on = set(pending)
+            if sketching:
+                waiting_on.add(sketching[0][1])
+            done, _ = wait(waiting_on, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut not in pending:
+                    continue  # a sketch; handled at the top of the loop
+                name, extra = pending.pop(fut)
+                in_flight.discard(name)
+                result = fut.result()
+                bundle.add(result, extra)
+                if result["error"] is not None and index is not None:
+                    failed_reps.add(name)
+                for dup_name, dup, action in waiting.pop(name, ()):
+                    bundle.add_duplicate(dup_name, dup, action, result["error"] is not None)
+        return (bundle.written, bundle.failed, bundle.duplicates)
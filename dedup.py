@@ -0,0 +1,252 @@
+from __future__ import annotations
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from models import ResumeData
+from fileio import as_resume
+from parallel import chunks, run_ordered
+
+# 64 MinHash values in 16 bands of 4 rows: pairs with Jaccard similarity
+# around 0.5 and up usually share a band; candidates are then verified
+# against `threshold` using the signature estimate.
+NUM_PERM = 64
+BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+# Resumes with fewer features than this are only matched exactly; on very
+# sparse resumes a few shared skills would otherwise look like a duplicate.
+MIN_NEAR_FEATURES = 8
+# Only this many representatives are compared per LSH bucket, which keeps
+# the scan close to linear even for very common boilerplate.
+MAX_BUCKET = 32
+
+_EMPTY = 1 << 64  # above any bin value (a 64-bit hash divided by num_perm)
+_NON_WORD = re.compile(r"[^\w+#]+")  # keep c++ / c# intact
+
+
+# (fingerprint, MinHash signature, identity tokens)
+Sketch = Tuple[str, Tuple[int, ...], Tuple[str, ...]]
+
+
+class Duplicate(BaseModel):
+    key: str
+    of: str             # key of the first-seen representative
+    kind: str           # "exact" or "near"
+    similarity: float   # estimated Jaccard over bullets and skills
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def _norm(value):
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, list):
+        return [_norm(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _norm(v) for k, v in value.items()}
+    return value
+
+
+def fingerprint(resume: ResumeData) -> str:
+    """Hash of the normalized content; equal for case/punctuation/spacing-only edits."""
+    raw = resume.model_dump(exclude={"schema_version", "section_personal", "section_education",
+                                     "section_experience", "section_skills", "section_projects",
+                                     "section_awards"})
+    doc = json.dumps(_norm(raw), sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(doc.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def features(resume: ResumeData) -> Set[str]:
+    """Word 3-shingles of every bullet plus one token per skill item."""
+    out: Set[str] = set()
+    bullets = [b for x in resume.experience for b in x.responsibilities]
+    bullets += [b for p in resume.projects for b in p.description_bullets]
+    for bullet in bullets:
+        words = normalize_text(bullet).split()
+        if len(words) < 3:
+            if words:
+                out.add("b:" + " ".join(words))
+            continue
+        for i in range(len(words) - 2):
+            out.add("b:" + " ".join(words[i:i + 3]))
+    for s in resume.skills:
+        for d in s.details:
+            token = normalize_text(d)
+            if token:
+                out.add("s:" + token)
+    return out
+
+
+def identity(resume: ResumeData) -> Tuple[str, ...]:
+    """
+    Normalized email, phone digits and name. A near match needs at least one
+    of these in common: similar content alone does not make the same person.
+    """
+    p = resume.personal
+    out = []
+    email = p.email.strip().casefold()
+    if email:
+        out.append("e:" + email)
+    phone = "".join(c for c in p.phone if c.isdigit())
+    if len(phone) >= 7:
+        out.append("p:" + phone[-10:])  # ignore country-code formatting
+    name = normalize_text(p.full_name)
+    if name:
+        out.append("n:" + name)
+    return tuple(out)
+
+
+def minhash(feats: Iterable[str], num_perm: int = NUM_PERM) -> Tuple[int, ...]:
+    """
+    One-permutation MinHash: every feature is hashed once and kept as the
+    minimum of one of `num_perm` bins, instead of being hashed num_perm
+    times. Empty bins borrow from the next non-empty bin (rotation
+    densification) so signatures stay comparable position by position.
+    """
+    sig = [_EMPTY] * num_perm
+    for f in feats:
+        v = int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "little")
+        b, h = v % num_perm, v // num_perm
+        if h < sig[b]:
+            sig[b] = h
+    if all(h == _EMPTY for h in sig):
+        return ()
+    out = list(sig)
+    for j in range(num_perm):
+        if sig[j] == _EMPTY:
+            t = 1
+            while sig[(j + t) % num_perm] == _EMPTY:
+                t += 1
+            out[j] = sig[(j + t) % num_perm] + t * _EMPTY
+    return tuple(out)
+
+
+def sketch(resume: ResumeData, num_perm: int = NUM_PERM) -> Sketch:
+    """
+    (fingerprint, MinHash signature, identity); the expensive, parallelizable
+    part. The signature is empty when the resume is too sparse, or has no
+    identity, for near matching.
+    """
+    feats = features(resume)
+    ident = identity(resume)
+    sig = minhash(feats, num_perm) if ident and len(feats) >= MIN_NEAR_FEATURES else ()
+    return fingerprint(resume), sig, ident
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """
+    Jaccard estimate over the bins that are non-empty on either side
+    (densified values are ignored). Unlike comparing all bins, this is
+    close to exact for sparse resumes where most features get a bin of
+    their own.
+    """
+    if not a or not b:
+        return 0.0
+    matches = used = 0
+    for x, y in zip(a, b):
+        if x < _EMPTY or y < _EMPTY:
+            used += 1
+            matches += x == y
+    return matches / used if used else 0.0
+
+
+class DedupIndex:
+    """
+    Streaming exact + near-duplicate detector. Records are checked in the
+    order they are added; the first record of each group becomes its
+    representative and only representatives are indexed, so both memory and
+    work per record stay bounded.
+    """
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM, bands: int = BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self._rows = num_perm // bands
+        self._exact: Dict[str, Tuple[str, str, float]] = {}  # fingerprint -> (rep, kind, similarity)
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...], str], List[str]] = {}
+
+    def add(self, key: str, resume: ResumeData) -> Optional[Duplicate]:
+        return self.add_sketch(key, *sketch(resume, self.num_perm))
+
+    def add_sketch(self, key: str, fp: str, sig: Tuple[int, ...], ident: Tuple[str, ...] = ()) -> Optional[Duplicate]:
+        hit = self._exact.get(fp)
+        if hit is not None:
+            # Same content as an earlier record: inherit its verdict, so `of`
+            # is always a representative.
+            of, kind, sim = hit
+            return Duplicate(key=key, of=of, kind=kind, similarity=sim)
+        self._exact[fp] = (key, "exact", 1.0)
+
+        if not sig or not ident:
+            return None  # nothing to compare beyond the exact fingerprint
+        # Identity is part of the band key, so only records that share an
+        # email, phone or name with this one are ever candidates.
+        band_keys = [
+            (b, sig[b * self._rows:(b + 1) * self._rows], tok)
+            for b in range(self.bands) for tok in ident
+        ]
+
+        best: Optional[Tuple[float, str]] = None
+        seen: Set[str] = set()
+        for bk in band_keys:
+            for cand in self._buckets.get(bk, ()):
+                if cand in seen:
+                    continue
+                seen.add(cand)
+                sim = similarity(sig, self._signatures[cand])
+                if sim >= self.threshold and (best is None or sim > best[0]):
+                    best = (sim, cand)
+        if best is not None:
+            sim = round(best[0], 3)
+            self._exact[fp] = (best[1], "near", sim)
+            return Duplicate(key=key, of=best[1], kind="near", similarity=sim)
+
+        self._signatures[key] = sig
+        for bk in band_keys:
+            bucket = self._buckets.setdefault(bk, [])
+            if len(bucket) < MAX_BUCKET:
+                bucket.append(key)
+        return None
+
+
+def _sketch_batch(batch: List[Tuple[str, Any]]) -> List[Tuple[str, Optional[Sketch], Optional[str]]]:
+    out = []
+    for key, source in batch:
+        try:
+            out.append((key, sketch(as_resume(source)), None))
+        except Exception as e:
+            out.append((key, None, f"{type(e).__name__}: {e}"))
+    return out
+
+
+def find_duplicates(
+    items: Iterable[Tuple[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD,
+    jobs: Optional[int] = None,
+    on_error: Optional[Callable[[str], None]] = None,
+) -> Iterator[Duplicate]:
+    """
+    Scan (key, source) pairs, where source is anything fileio.as_resume
+    accepts. Loading and sketching run across processes; only the cheap
+    index lookups are sequential. Records that fail to load are passed to
+    `on_error` and skipped.
+    """
+    index = DedupIndex(threshold=threshold)
+    for key, sk, error in run_ordered(_sketch_batch, chunks(items, 200), jobs):
+        if error:
+            if on_error:
+                on_error(f"{key}: {error}")
+            continue
+        dup = index.add_sketch(key, *sk)
+        if dup is not None:
+            yield dup
@@ -0,0 +1,89 @@
+from __future__ import annotations
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Union
+
+from models import ResumeData
+from migrations import parse_resume
+
+PathLike = Union[str, Path]
+
+
+def iter_resume_files(paths: Iterable[PathLike]) -> Iterator[Path]:
+    """
+    Expand a mix of files and directories into resume JSON files.
+    Directories contribute their *.json files (non-recursive, sorted).
+    """
+    for p in paths:
+        p = Path(p)
+        if p.is_dir():
+            yield from sorted(f for f in p.glob("*.json") if f.is_file())
+        else:
+            yield p
+
+
+def load_resume(path: PathLike) -> ResumeData:
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    return parse_resume(raw)
+
+
+def as_resume(source: Any) -> ResumeData:
+    """
+    Accepts a ResumeData, a Path to a JSON file, a parsed dict or a JSON
+    string, so loading and validation can be deferred to a worker process.
+    """
+    if isinstance(source, ResumeData):
+        return source
+    if isinstance(source, Path):
+        return load_resume(source)
+    if isinstance(source, dict):
+        return parse_resume(source)
+    return parse_resume(json.loads(source))
+
+
+def _file_mode(path: Path) -> int:
+    """Mode for a replacement of `path`: keep the existing one, else what open() would use."""
+    try:
+        return path.stat().st_mode & 0o7777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_open(path: PathLike) -> Iterator[BinaryIO]:
+    """
+    Binary file handle on a temp file in the same directory, os.replace()d
+    into place on success, so readers only ever see the old or the complete
+    new file. On error the temp file is removed. The result gets the
+    target's existing permissions (mkstemp alone would leave it 0600).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.chmod(tmp, _file_mode(path))
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_bytes(path: PathLike, data: bytes):
+    with atomic_open(path) as f:
+        f.write(data)
+
+
+def atomic_write_text(path: PathLike, text: str):
+    atomic_write_bytes(path, text.encode("utf-8"))
@@ -0,0 +1,141 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from models import ResumeData
+
+LIST_SECTIONS = ("education", "experience", "skills", "projects", "awards")
+
+
+def freeze(value):
+    if isinstance(value, BaseModel):
+        return tuple((k, freeze(v)) for k, v in value.__dict__.items())
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def _share(new: BaseModel, old_items: List[BaseModel], idx: int, lookup: Dict) -> BaseModel:
+    # Cheap positional check first (the common "edited one field" case),
+    # then fall back to a content lookup for inserted/removed/moved entries.
+    if idx < len(old_items) and old_items[idx] == new:
+        return old_items[idx]
+    if not lookup:
+        for old in old_items:
+            lookup.setdefault(freeze(old), old)
+    return lookup.get(freeze(new), new)
+
+
+class UndoHistory:
+    """
+    Linear undo/redo stack of immutable ResumeData snapshots.
+
+    Consecutive snapshots share every unchanged sub-object (personal info and
+    section entries), so a snapshot only costs the entries that actually
+    changed. Snapshots must be treated as read-only; callers that want to edit
+    should work on a model_copy().
+    """
+    def __init__(self, initial: Optional[ResumeData] = None, max_bytes: int = 8 * 1024 * 1024, max_depth: int = 500):
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self._snapshots: List[ResumeData] = []
+        self._index = -1
+        # id(obj) -> [obj, refcount, approx_bytes] across all held snapshots
+        self._objects: Dict[int, list] = {}
+        self.bytes_used = 0
+        self.reset(initial or ResumeData())
+
+    # ---------- Bookkeeping ----------
+    def _parts(self, snap: ResumeData) -> List[BaseModel]:
+        parts: List[BaseModel] = [snap.personal]
+        for name in LIST_SECTIONS:
+            parts.extend(getattr(snap, name))
+        return parts
+
+    def _retain(self, snap: ResumeData):
+        for obj in self._parts(snap):
+            rec = self._objects.get(id(obj))
+            if rec is None:
+                size = len(obj.model_dump_json())
+                self._objects[id(obj)] = [obj, 1, size]
+                self.bytes_used += size
+            else:
+                rec[1] += 1
+
+    def _release(self, snap: ResumeData):
+        for obj in self._parts(snap):
+            rec = self._objects[id(obj)]
+            rec[1] -= 1
+            if rec[1] == 0:
+                self.bytes_used -= rec[2]
+                del self._objects[id(obj)]
+
+    def _enforce_limits(self):
+        # Never evict the current snapshot; drop the oldest undo states first.
+        while self._index > 0 and (len(self._snapshots) > self.max_depth or self.bytes_used > self.max_bytes):
+            self._release(self._snapshots.pop(0))
+            self._index -= 1
+
+    # ---------- Public API ----------
+    @property
+    def current(self) -> ResumeData:
+        return self._snapshots[self._index]
+
+    def can_undo(self) -> bool:
+        return self._index > 0
+
+    def can_redo(self) -> bool:
+        return self._index < len(self._snapshots) - 1
+
+    def reset(self, data: ResumeData):
+        for snap in self._snapshots:
+            self._release(snap)
+        snap = data.model_copy()
+        self._snapshots = [snap]
+        self._index = 0
+        self._retain(snap)
+
+    def push(self, data: ResumeData) -> bool:
+        """
+        Record a new state. Returns False (and records nothing) if data is
+        equal to the current snapshot.
+        """
+        prev = self.current
+        fields = {k: v for k, v in data.__dict__.items() if k not in LIST_SECTIONS and k != "personal"}
+        fields["personal"] = prev.personal if prev.personal == data.personal else data.personal
+
+        changed = fields["personal"] is not prev.personal
+        for name in LIST_SECTIONS:
+            old_items = getattr(prev, name)
+            lookup: Dict[Tuple, BaseModel] = {}
+            items = [_share(e, old_items, i, lookup) for i, e in enumerate(getattr(data, name))]
+            if len(items) != len(old_items) or any(a is not b for a, b in zip(items, old_items)):
+                changed = True
+            else:
+                items = old_items
+            fields[name] = items
+        if not changed and all(getattr(prev, k) == v for k, v in fields.items()):
+            return False
+
+        snap = ResumeData.model_construct(**fields)
+        for dropped in self._snapshots[self._index + 1:]:
+            self._release(dropped)
+        del self._snapshots[self._index + 1:]
+        self._snapshots.append(snap)
+        self._index += 1
+        self._retain(snap)
+        self._enforce_limits()
+        return True
+
+    def undo(self) -> Optional[ResumeData]:
+        if not self.can_undo():
+            return None
+        self._index -= 1
+        return self.current
+
+    def redo(self) -> Optional[ResumeData]:
+        if not self.can_redo():
+            return None
+        self._index += 1
+        return self.current
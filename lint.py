@@ -0,0 +1,222 @@
+from __future__ import annotations
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from models import ResumeData
+from fileio import load_resume
+from history import LIST_SECTIONS, freeze
+
+# Roughly one line of 11pt text between the template's 0.8in margins
+MAX_BULLET_CHARS = 110
+# A leading verb may appear this many times across the whole resume
+MAX_VERB_REPEATS = 2
+
+LATEX_SPECIALS = set("#$%&_{}~^\\")
+
+# What templates/resume.tex.j2 already escapes, per field. Fields not listed
+# are emitted verbatim.
+_AMP = {"&"}
+_ESCAPED: Dict[str, set] = {
+    "full_name": _AMP,
+    "school_name": _AMP, "school_location": _AMP, "degree": _AMP, "major": _AMP,
+    "company_name": _AMP, "company_location": _AMP, "job_title": _AMP,
+    "name": _AMP, "details": _AMP,
+    "project_name": _AMP, "genre": _AMP,
+    "award_name": _AMP, "awarder": _AMP, "summary": _AMP,
+    "responsibilities": {"%", "&"}, "description_bullets": {"%", "&"},
+}
+# Rendered only as a \href{...} target, or not rendered at all. email is
+# checked: it is also printed verbatim as the link text.
+_SKIP_FIELDS = {"portfolio", "linkedin", "github", "link", "tools_used"}
+_BULLET_FIELDS = {"experience": "responsibilities", "projects": "description_bullets"}
+_DATED_SECTIONS = ("education", "experience", "projects")
+# The awards block hides these fields when they are exactly "N/A"
+_NA_AWARE = {"awarder", "award_date"}
+_NA_RE = re.compile(r"^\s*n\s*[/.]?\s*a\.?\s*$", re.IGNORECASE)
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z'-]*")
+
+
+class LintIssue(BaseModel):
+    section: str                 # "personal", "headings" or a list section name
+    index: Optional[int] = None  # entry index within a list section
+    field: str
+    rule: str
+    message: str
+
+
+def _unescaped_specials(text: str, escaped: set) -> List[str]:
+    found = set()
+    for i, ch in enumerate(text):
+        if ch not in LATEX_SPECIALS or ch in escaped:
+            continue
+        if ch == "\\":
+            # Hand-written escapes like \$ are fine, unless the template
+            # escapes that character too (\& would become \\&).
+            if i + 1 < len(text) and text[i + 1] in LATEX_SPECIALS - escaped - {"\\"}:
+                continue
+        elif i > 0 and text[i - 1] == "\\":
+            continue
+        found.add(ch)
+    return sorted(found)
+
+
+def _leading_verb(bullet: str) -> Optional[str]:
+    m = _WORD_RE.search(bullet)
+    return m.group(0).lower() if m else None
+
+
+def _check_text(section: str, index: Optional[int], field: str, text: str, issues: List[LintIssue]):
+    if not text or field in _SKIP_FIELDS:
+        return
+    bad = _unescaped_specials(text, _ESCAPED.get(field, set()))
+    if bad:
+        issues.append(LintIssue(
+            section=section, index=index, field=field, rule="latex-special",
+            message=f"unescaped LaTeX special character(s) {' '.join(bad)}",
+        ))
+    if _NA_RE.match(text) and not (field in _NA_AWARE and text == "N/A"):
+        hint = 'use exactly "N/A" or leave it empty' if field in _NA_AWARE else "leave it empty instead"
+        issues.append(LintIssue(
+            section=section, index=index, field=field, rule="placeholder",
+            message=f'placeholder "{text}" will be printed verbatim; {hint}',
+        ))
+
+
+def lint_entry(section: str, index: Optional[int], entry: BaseModel, max_bullet_chars: int = MAX_BULLET_CHARS) -> List[LintIssue]:
+    """
+    Rules that only look at a single entry. Cross-entry rules (repeated
+    leading verbs) are applied by Linter.lint().
+    """
+    issues: List[LintIssue] = []
+    for field, value in entry.__dict__.items():
+        if isinstance(value, list):
+            for v in value:
+                _check_text(section, index, field, v, issues)
+        elif isinstance(value, str):
+            _check_text(section, index, field, value, issues)
+
+    if section in _DATED_SECTIONS and any(entry.__dict__.values()):
+        for field in ("start_date", "end_date"):
+            if not getattr(entry, field).strip():
+                issues.append(LintIssue(
+                    section=section, index=index, field=field, rule="empty-date",
+                    message="date is empty; the template prints a dangling \"-\"",
+                ))
+
+    bullet_field = _BULLET_FIELDS.get(section)
+    if bullet_field:
+        seen = set()
+        for n, bullet in enumerate(getattr(entry, bullet_field), start=1):
+            if len(bullet) > max_bullet_chars:
+                issues.append(LintIssue(
+                    section=section, index=index, field=bullet_field, rule="bullet-length",
+                    message=f"bullet {n} is {len(bullet)} chars (> {max_bullet_chars}), likely wraps to two lines",
+                ))
+            verb = _leading_verb(bullet)
+            if verb and verb in seen:
+                issues.append(LintIssue(
+                    section=section, index=index, field=bullet_field, rule="duplicate-verb",
+                    message=f'bullet {n} repeats the leading verb "{verb}" within this entry',
+                ))
+            seen.add(verb)
+    return issues
+
+
+class Linter:
+    """
+    Incremental linter: per-entry results are cached by entry content, so
+    only entries whose content changed since the previous run are
+    re-checked, wherever they moved to. Snapshots from UndoHistory share
+    unchanged entries, so those are found by identity without re-hashing.
+    """
+    def __init__(self, max_bullet_chars: int = MAX_BULLET_CHARS, max_verb_repeats: int = MAX_VERB_REPEATS):
+        self.max_bullet_chars = max_bullet_chars
+        self.max_verb_repeats = max_verb_repeats
+        # (section, frozen entry) -> issues, with index left unset
+        self._cache: Dict[Tuple[str, tuple], List[LintIssue]] = {}
+        # id(entry) -> (entry, frozen entry) for entries seen last run
+        self._frozen: Dict[int, Tuple[BaseModel, tuple]] = {}
+        self.last_checked = 0  # entries re-linted by the most recent run
+
+    def _entry(self, section: str, index: Optional[int], entry: BaseModel, live: Dict) -> List[LintIssue]:
+        rec = self._frozen.get(id(entry))
+        frozen = rec[1] if rec is not None and rec[0] is entry else freeze(entry)
+        key = (section, frozen)
+        live[id(entry)] = (entry, frozen)
+        live[key] = None  # marks the cache entry as in use
+        issues = self._cache.get(key)
+        if issues is None:
+            issues = self._cache[key] = lint_entry(section, None, entry, self.max_bullet_chars)
+            self.last_checked += 1
+        if index is None:
+            return issues
+        return [i.model_copy(update={"index": index}) for i in issues]
+
+    def lint(self, resume: ResumeData) -> List[LintIssue]:
+        self.last_checked = 0
+        issues: List[LintIssue] = []
+        live: Dict = {}  # id(entry) -> (entry, frozen), plus the cache keys used
+
+        issues.extend(self._entry("personal", None, resume.personal, live))
+        for field, value in resume.__dict__.items():
+            if field.startswith("section_"):
+                _check_text("headings", None, field, value, issues)
+
+        verbs: Counter = Counter()
+        for section in LIST_SECTIONS:
+            for index, entry in enumerate(getattr(resume, section)):
+                issues.extend(self._entry(section, index, entry, live))
+                bullet_field = _BULLET_FIELDS.get(section)
+                if bullet_field:
+                    verbs.update(v for v in map(_leading_verb, getattr(entry, bullet_field)) if v)
+
+        self._frozen = {k: v for k, v in live.items() if v is not None}
+        for key in [k for k in self._cache if k not in live]:
+            del self._cache[key]
+
+        overused = {v for v, n in verbs.items() if n > self.max_verb_repeats}
+        if overused:
+            for section, bullet_field in _BULLET_FIELDS.items():
+                for index, entry in enumerate(getattr(resume, section)):
+                    seen = set()  # repeats inside one entry are reported by lint_entry
+                    for n, bullet in enumerate(getattr(entry, bullet_field), start=1):
+                        verb = _leading_verb(bullet)
+                        if verb in overused and verb not in seen:
+                            seen.add(verb)
+                            issues.append(LintIssue(
+                                section=section, index=index, field=bullet_field, rule="duplicate-verb",
+                                message=f'bullet {n} starts with "{verb}", used {verbs[verb]} times across the resume',
+                            ))
+        return issues
+
+
+def lint_resume(resume: ResumeData, **kwargs) -> List[LintIssue]:
+    return Linter(**kwargs).lint(resume)
+
+
+def _lint_file(args) -> Tuple[str, List[LintIssue], Optional[str]]:
+    path, kwargs = args
+    try:
+        return (path, lint_resume(load_resume(path), **kwargs), None)
+    except Exception as e:
+        return (path, [], f"{type(e).__name__}: {e}")
+
+
+def lint_files(paths: Iterable[Path], jobs: Optional[int] = None, **kwargs) -> Iterator[Tuple[str, List[LintIssue], Optional[str]]]:
+    """
+    Lint many resume files across processes. Yields (path, issues, error)
+    in input order; error is set when the file could not be loaded.
+    """
+    work = [(str(p), kwargs) for p in paths]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(work) < 2:
+        yield from map(_lint_file, work)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(_lint_file, work, chunksize=max(1, len(work) // (jobs * 8)))
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 from dataclasses import asdict
+from difflib import SequenceMatcher
 from pathlib import Path
 from typing import List, Optional
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QEvent, QObject, QThread, QTimer, Signal, Slot
+from PySide6.QtGui import QKeySequence
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QTabWidget, QVBoxLayout, QHBoxLayout,
     QFormLayout, QLineEdit, QTextEdit, QPushButton, QLabel, QFileDialog,
@@ -14,6 +16,9 @@ from PySide6.QtWidgets import (
 
 from models import ResumeData, EducationEntry, ExperienceEntry, SkillCategory, ProjectEntry, AwardEntry, PersonalInfo
 from latex import render_latex
+from history import UndoHistory, freeze
+from lint import Linter
+from migrations import parse_resume
 
 
 APP_TITLE = "Resume Builder (Template-based)"
@@ -27,14 +32,46 @@ def warn(msg: str, parent=None):
     QMessageBox.warning(parent, APP_TITLE, msg)
 
 
+def _lint_label() -> QLabel:
+    label = QLabel()
+    label.setWordWrap(True)
+    label.setStyleSheet("QLabel { color: #b36b00; font-weight: normal; }")
+    label.hide()
+    return label
+
+
+def _show_issues(label: QLabel, issues):
+    if issues:
+        label.setText("\n".join(f"\u26a0 {i.field}: {i.message}" for i in issues))
+        label.show()
+    else:
+        label.clear()
+        label.hide()
+
+
+class LintWorker(QObject):
+    """Runs the incremental Linter on its own thread."""
+    finished = Signal(object, object)  # (snapshot, issues)
+
+    def __init__(self):
+        super().__init__()
+        self.linter = Linter()
+
+    @Slot(object)
+    def run(self, snap: ResumeData):
+        self.finished.emit(snap, self.linter.lint(snap))
+
+
 class Repeater(QWidget):
     """
     A simple repeating section: user can add/remove cards of a certain type.
     You provide:
-      - factory() -> object
-      - render(item, container_layout) -> list of field widgets or a callable getter
+      - builder(item=None) -> (card_widget, getter)
     We keep it practical: each card returns a getter() that rebuilds the item.
+    Any edit inside a card (or adding/removing one) emits `changed`.
     """
+    changed = Signal()
+
     def __init__(self, title: str, parent=None):
         super().__init__(parent)
         self.title = title
@@ -43,6 +80,8 @@ class Repeater(QWidget):
         self.cards_layout = QVBoxLayout()
         self.outer.addLayout(self.cards_layout)
         self.cards = []  # list[tuple[QWidget, callable]]
+        self.builder = None
+        self.lint_labels = {}  # card widget -> QLabel
 
     def clear(self):
         while self.cards_layout.count():
@@ -51,10 +90,30 @@ class Repeater(QWidget):
             if w:
                 w.deleteLater()
         self.cards = []
+        self.lint_labels = {}
+        self.changed.emit()
+
+    def _watch(self, card_widget: QWidget):
+        for w in card_widget.findChildren(QLineEdit):
+            w.textChanged.connect(lambda *_: self.changed.emit())
+        for w in card_widget.findChildren(QTextEdit):
+            w.setUndoRedoEnabled(False)  # the window-level history owns undo
+            w.textChanged.connect(lambda *_: self.changed.emit())
 
     def add_card(self, card_widget: QWidget, getter):
-        self.cards_layout.addWidget(card_widget)
-        self.cards.append((card_widget, getter))
+        self.insert_card(len(self.cards), card_widget, getter)
+
+    def insert_card(self, index: int, card_widget: QWidget, getter):
+        self._watch(card_widget)
+        label = _lint_label()
+        card_widget.layout().addWidget(label)
+        self.lint_labels[card_widget] = label
+        self.cards_layout.insertWidget(index, card_widget)
+        self.cards.insert(index, (card_widget, getter))
+        self.changed.emit()
+
+    def append(self, item=None):
+        self.add_card(*self.builder(item))
 
     def remove_card(self, card_widget: QWidget):
         for idx, (w, _) in enumerate(self.cards):
@@ -63,19 +122,54 @@ class Repeater(QWidget):
                 w.setParent(None)
                 w.deleteLater()
                 self.cards.pop(idx)
+                self.lint_labels.pop(w, None)
+                self.changed.emit()
                 return
 
     def values(self):
         return [g() for _, g in self.cards]
 
+    def set_issues(self, by_index):
+        """Show lint issues ({card index: [LintIssue]}) under each card."""
+        for idx, (w, _) in enumerate(self.cards):
+            _show_issues(self.lint_labels[w], by_index.get(idx, []))
+
+    def sync(self, items):
+        """
+        Make the cards match `items`, rebuilding only the cards whose content
+        differs. Cards are matched by content, not position, so inserting or
+        removing one entry leaves every other card's widgets in place.
+        """
+        current = [freeze(g()) for _, g in self.cards]
+        wanted = [freeze(item) for item in items]
+        ops = SequenceMatcher(None, current, wanted, autojunk=False).get_opcodes()
+        # Right to left, so earlier card indices stay valid
+        for tag, i1, i2, j1, j2 in reversed(ops):
+            if tag == "equal":
+                continue
+            for w, _ in self.cards[i1:i2]:
+                self.remove_card(w)
+            for offset, item in enumerate(items[j1:j2]):
+                self.insert_card(i1 + offset, *self.builder(item))
+
 
 class MainWindow(QMainWindow):
+    lint_requested = Signal(object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle(APP_TITLE)
         self.resize(1100, 720)
 
         self.data = ResumeData()  # defaults from your resume
+        self.history = UndoHistory(self.data)
+        self._restoring = False
+
+        # Coalesce keystrokes into one undo step
+        self._edit_timer = QTimer(self)
+        self._edit_timer.setSingleShot(True)
+        self._edit_timer.setInterval(400)
+        self._edit_timer.timeout.connect(self._commit_snapshot)
 
         root = QWidget()
         self.setCentralWidget(root)
@@ -92,8 +186,12 @@ class MainWindow(QMainWindow):
         self.btn_export_json = QPushButton("Export JSON")
         self.btn_export_tex = QPushButton("Export LaTeX (.tex)")
         self.btn_load_json = QPushButton("Load JSON")
+        self.btn_undo = QPushButton("Undo")
+        self.btn_redo = QPushButton("Redo")
 
         btn_row.addWidget(self.btn_load_json)
+        btn_row.addWidget(self.btn_undo)
+        btn_row.addWidget(self.btn_redo)
         btn_row.addStretch(1)
         btn_row.addWidget(self.btn_export_json)
         btn_row.addWidget(self.btn_export_tex)
@@ -101,6 +199,12 @@ class MainWindow(QMainWindow):
         self.btn_export_json.clicked.connect(self.export_json)
         self.btn_export_tex.clicked.connect(self.export_tex)
         self.btn_load_json.clicked.connect(self.load_json)
+        self.btn_undo.clicked.connect(self.undo)
+        self.btn_redo.clicked.connect(self.redo)
+        # Undo/redo keys go to the window history even when a text field has
+        # focus; otherwise the field's own undo would push a new snapshot
+        # and discard the redo stack.
+        QApplication.instance().installEventFilter(self)
 
         # Build tabs
         self.tab_personal = self._build_personal_tab()
@@ -117,6 +221,18 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.tab_projects, "Projects")
         self.tabs.addTab(self.tab_awards, "Honors & Awards")
 
+        self._edit_timer.stop()  # seeding the cards is not an edit
+        self._update_undo_buttons()
+
+        # Linting happens off the UI thread on every committed snapshot
+        self._lint_thread = QThread(self)
+        self._lint_worker = LintWorker()
+        self._lint_worker.moveToThread(self._lint_thread)
+        self.lint_requested.connect(self._lint_worker.run)
+        self._lint_worker.finished.connect(self._show_lint)
+        self._lint_thread.start()
+        self.lint_requested.emit(self.history.current)
+
     # ---------- Utilities ----------
     def _wrap_scroll(self, inner: QWidget) -> QWidget:
         scroll = QScrollArea()
@@ -129,6 +245,17 @@ class MainWindow(QMainWindow):
         gb.setStyleSheet("QGroupBox { font-weight: 600; }")
         return gb
 
+    def _personal_fields(self) -> dict:
+        return {
+            "full_name": self.p_full_name,
+            "email": self.p_email,
+            "phone": self.p_phone,
+            "location": self.p_location,
+            "portfolio": self.p_portfolio,
+            "linkedin": self.p_linkedin,
+            "github": self.p_github,
+        }
+
     def gather(self) -> ResumeData:
         # Personal
         self.data.personal = PersonalInfo(
@@ -178,6 +305,11 @@ class MainWindow(QMainWindow):
         form.addRow("Portfolio", self.p_portfolio)
         form.addRow("LinkedIn", self.p_linkedin)
         form.addRow("GitHub", self.p_github)
+        self.p_lint = _lint_label()
+        form.addRow(self.p_lint)
+
+        for w in self._personal_fields().values():
+            w.textChanged.connect(self._on_edit)
 
         layout.addWidget(gb)
         layout.addStretch(1)
@@ -195,9 +327,10 @@ class MainWindow(QMainWindow):
         header.addWidget(add_btn)
 
         self.education_rep = Repeater("Education")
+        self.education_rep.changed.connect(self._on_edit)
         layout.addWidget(self.education_rep)
 
-        def add_card(initial: Optional[EducationEntry] = None):
+        def build_card(initial: Optional[EducationEntry] = None):
             e = initial or EducationEntry()
             gb = self._groupbox("School")
             form = QFormLayout(gb)
@@ -242,13 +375,14 @@ class MainWindow(QMainWindow):
                 self.education_rep.remove_card(gb)
 
             rm.clicked.connect(remove_this)
-            self.education_rep.add_card(gb, getter)
+            return gb, getter
 
-        add_btn.clicked.connect(lambda: add_card())
+        self.education_rep.builder = build_card
+        add_btn.clicked.connect(lambda: self.education_rep.append())
 
         # seed from existing data
         for e in self.data.education:
-            add_card(e)
+            self.education_rep.append(e)
 
         layout.addStretch(1)
         return self._wrap_scroll(inner)
@@ -265,9 +399,10 @@ class MainWindow(QMainWindow):
         header.addWidget(add_btn)
 
         self.experience_rep = Repeater("Experience")
+        self.experience_rep.changed.connect(self._on_edit)
         layout.addWidget(self.experience_rep)
 
-        def add_card(initial: Optional[ExperienceEntry] = None):
+        def build_card(initial: Optional[ExperienceEntry] = None):
             x = initial or ExperienceEntry()
             gb = self._groupbox("Job")
             form = QFormLayout(gb)
@@ -278,7 +413,8 @@ class MainWindow(QMainWindow):
             start = QLineEdit(x.start_date)
             end = QLineEdit(x.end_date)
 
-            bullets = QTextEdit("\n".join(x.responsibilities))
+            bullets = QTextEdit()
+            bullets.setPlainText("\n".join(x.responsibilities))
             bullets.setPlaceholderText("One bullet per line...")
 
             form.addRow("Company Name", company)
@@ -310,12 +446,13 @@ class MainWindow(QMainWindow):
                 self.experience_rep.remove_card(gb)
 
             rm.clicked.connect(remove_this)
-            self.experience_rep.add_card(gb, getter)
+            return gb, getter
 
-        add_btn.clicked.connect(lambda: add_card())
+        self.experience_rep.builder = build_card
+        add_btn.clicked.connect(lambda: self.experience_rep.append())
 
         for x in self.data.experience:
-            add_card(x)
+            self.experience_rep.append(x)
 
         layout.addStretch(1)
         return self._wrap_scroll(inner)
@@ -332,15 +469,17 @@ class MainWindow(QMainWindow):
         header.addWidget(add_btn)
 
         self.skills_rep = Repeater("Skills")
+        self.skills_rep.changed.connect(self._on_edit)
         layout.addWidget(self.skills_rep)
 
-        def add_card(initial: Optional[SkillCategory] = None):
+        def build_card(initial: Optional[SkillCategory] = None):
             s = initial or SkillCategory()
             gb = self._groupbox("Skill Category")
             form = QFormLayout(gb)
 
             name = QLineEdit(s.name)
-            details = QTextEdit("\n".join(s.details))
+            details = QTextEdit()
+            details.setPlainText("\n".join(s.details))
             details.setPlaceholderText("One item per line (will render comma-separated)...")
 
             form.addRow("Skill Name", name)
@@ -361,12 +500,13 @@ class MainWindow(QMainWindow):
                 self.skills_rep.remove_card(gb)
 
             rm.clicked.connect(remove_this)
-            self.skills_rep.add_card(gb, getter)
+            return gb, getter
 
-        add_btn.clicked.connect(lambda: add_card())
+        self.skills_rep.builder = build_card
+        add_btn.clicked.connect(lambda: self.skills_rep.append())
 
         for s in self.data.skills:
-            add_card(s)
+            self.skills_rep.append(s)
 
         layout.addStretch(1)
         return self._wrap_scroll(inner)
@@ -383,9 +523,10 @@ class MainWindow(QMainWindow):
         header.addWidget(add_btn)
 
         self.projects_rep = Repeater("Projects")
+        self.projects_rep.changed.connect(self._on_edit)
         layout.addWidget(self.projects_rep)
 
-        def add_card(initial: Optional[ProjectEntry] = None):
+        def build_card(initial: Optional[ProjectEntry] = None):
             p = initial or ProjectEntry()
             gb = self._groupbox("Project")
             form = QFormLayout(gb)
@@ -396,10 +537,12 @@ class MainWindow(QMainWindow):
             start = QLineEdit(p.start_date)
             end = QLineEdit(p.end_date)
 
-            bullets = QTextEdit("\n".join(p.description_bullets))
+            bullets = QTextEdit()
+            bullets.setPlainText("\n".join(p.description_bullets))
             bullets.setPlaceholderText("One bullet per line...")
 
-            tools = QTextEdit("\n".join(p.tools_used))
+            tools = QTextEdit()
+            tools.setPlainText("\n".join(p.tools_used))
             tools.setPlaceholderText("One tool per line (optional)...")
 
             form.addRow("Project Name", name)
@@ -434,12 +577,13 @@ class MainWindow(QMainWindow):
                 self.projects_rep.remove_card(gb)
 
             rm.clicked.connect(remove_this)
-            self.projects_rep.add_card(gb, getter)
+            return gb, getter
 
-        add_btn.clicked.connect(lambda: add_card())
+        self.projects_rep.builder = build_card
+        add_btn.clicked.connect(lambda: self.projects_rep.append())
 
         for p in self.data.projects:
-            add_card(p)
+            self.projects_rep.append(p)
 
         layout.addStretch(1)
         return self._wrap_scroll(inner)
@@ -456,9 +600,10 @@ class MainWindow(QMainWindow):
         header.addWidget(add_btn)
 
         self.awards_rep = Repeater("Awards")
+        self.awards_rep.changed.connect(self._on_edit)
         layout.addWidget(self.awards_rep)
 
-        def add_card(initial: Optional[AwardEntry] = None):
+        def build_card(initial: Optional[AwardEntry] = None):
             a = initial or AwardEntry()
             gb = self._groupbox("Award")
             form = QFormLayout(gb)
@@ -492,46 +637,120 @@ class MainWindow(QMainWindow):
                 self.awards_rep.remove_card(gb)
 
             rm.clicked.connect(remove_this)
-            self.awards_rep.add_card(gb, getter)
+            return gb, getter
 
-        add_btn.clicked.connect(lambda: add_card())
+        self.awards_rep.builder = build_card
+        add_btn.clicked.connect(lambda: self.awards_rep.append())
 
         for a in self.data.awards:
-            add_card(a)
+            self.awards_rep.append(a)
 
         layout.addStretch(1)
         return self._wrap_scroll(inner)
 
-    def _rebuild_repeater_from_widgets(self, rep: Repeater):
+    # ---------- Undo / Redo ----------
+    def _on_edit(self, *_):
+        if not self._restoring:
+            self._edit_timer.start()
+            self._update_undo_buttons()
+
+    def _commit_snapshot(self):
+        self._edit_timer.stop()
+        if self.history.push(self.gather()):
+            self.lint_requested.emit(self.history.current)
+        self._update_undo_buttons()
+
+    def _update_undo_buttons(self):
+        self.btn_undo.setEnabled(self.history.can_undo() or self._edit_timer.isActive())
+        self.btn_redo.setEnabled(self.history.can_redo())
+
+    def _apply(self, snap: ResumeData):
         """
-        When removing a card, easiest safe method is to:
-        - scan existing cards, reattach getters in same order
-        But we don't have direct card->getter map after deletion.
-        So we rebuild by reading the remaining getters from rep.getters
-        by filtering alive widgets. For simplicity: we rebuild by re-gathering.
+        Push a snapshot into the widgets, touching only what differs from
+        the current UI (no tab rebuild).
         """
-        # No-op approach here: removal already deletes widget;
-        # getters list may contain stale getter closures referencing deleted widgets.
-        # So we rebuild by forcing user to export/compile via gather(),
-        # but to keep correctness we do a simple "refresh":
-        # -> rebuild the whole tab from current gathered data when removing.
-        self.data = self.gather()
-
-        # Rebuild all tabs except personal (fast enough)
-        # NOTE: in a bigger app you'd keep a stable model-binding system.
-        self.tabs.clear()
-        self.tab_personal = self._build_personal_tab()
-        self.tab_education = self._build_education_tab()
-        self.tab_experience = self._build_experience_tab()
-        self.tab_skills = self._build_skills_tab()
-        self.tab_projects = self._build_projects_tab()
-        self.tab_awards = self._build_awards_tab()
-        self.tabs.addTab(self.tab_personal, "Personal")
-        self.tabs.addTab(self.tab_education, "Education")
-        self.tabs.addTab(self.tab_experience, "Work")
-        self.tabs.addTab(self.tab_skills, "Skills")
-        self.tabs.addTab(self.tab_projects, "Projects")
-        self.tabs.addTab(self.tab_awards, "Honors & Awards")
+        self._restoring = True
+        try:
+            for name, w in self._personal_fields().items():
+                value = getattr(snap.personal, name)
+                if w.text() != value:
+                    w.setText(value)
+            self.education_rep.sync(snap.education)
+            self.experience_rep.sync(snap.experience)
+            self.skills_rep.sync(snap.skills)
+            self.projects_rep.sync(snap.projects)
+            self.awards_rep.sync(snap.awards)
+            # Snapshots are shared with the history; gather() edits a copy
+            self.data = snap.model_copy()
+        finally:
+            self._restoring = False
+        self._update_undo_buttons()
+        self.lint_requested.emit(snap)
+
+    def _show_lint(self, snap: ResumeData, issues):
+        if snap is not self.history.current:
+            return  # a newer snapshot is already queued
+        by_section = {}
+        for issue in issues:
+            by_section.setdefault(issue.section, {}).setdefault(issue.index, []).append(issue)
+        _show_issues(self.p_lint, by_section.get("personal", {}).get(None, []))
+        self.education_rep.set_issues(by_section.get("education", {}))
+        self.experience_rep.set_issues(by_section.get("experience", {}))
+        self.skills_rep.set_issues(by_section.get("skills", {}))
+        self.projects_rep.set_issues(by_section.get("projects", {}))
+        self.awards_rep.set_issues(by_section.get("awards", {}))
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if kind in (QEvent.ShortcutOverride, QEvent.KeyPress, QEvent.ContextMenu) \
+                and obj.isWidgetType() and obj.window() is self:
+            if kind == QEvent.ContextMenu:
+                # A QTextEdit receives its context menu events on its viewport
+                field = obj if isinstance(obj, QLineEdit) else obj.parent()
+                if isinstance(field, (QLineEdit, QTextEdit)):
+                    self._edit_menu(field, event)
+                    return True
+            elif event.matches(QKeySequence.Undo) or event.matches(QKeySequence.Redo):
+                if kind == QEvent.KeyPress:
+                    if event.matches(QKeySequence.Undo):
+                        self.undo()
+                    else:
+                        self.redo()
+                event.accept()
+                return True
+        return super().eventFilter(obj, event)
+
+    def _edit_menu(self, field, event):
+        """The field's standard context menu, with Undo/Redo bound to the window history."""
+        menu = field.createStandardContextMenu()
+        for action in menu.actions():
+            if action.objectName() in ("edit-undo", "edit-redo"):
+                undo = action.objectName() == "edit-undo"
+                action.triggered.disconnect()
+                action.triggered.connect(self.undo if undo else self.redo)
+                action.setEnabled(self.history.can_undo() or self._edit_timer.isActive()
+                                  if undo else self.history.can_redo())
+        menu.exec(event.globalPos())
+        menu.deleteLater()
+
+    def closeEvent(self, event):
+        self._lint_thread.quit()
+        self._lint_thread.wait()
+        super().closeEvent(event)
+
+    def undo(self):
+        if self._edit_timer.isActive():
+            self._commit_snapshot()
+        snap = self.history.undo()
+        if snap is not None:
+            self._apply(snap)
+
+    def redo(self):
+        if self._edit_timer.isActive():
+            self._commit_snapshot()
+        snap = self.history.redo()
+        if snap is not None:
+            self._apply(snap)
 
     # ---------- Export / Import ----------
     def export_json(self):
@@ -557,9 +776,12 @@ class MainWindow(QMainWindow):
             return
         try:
             raw = json.loads(Path(path).read_text(encoding="utf-8"))
-            self.data = ResumeData.model_validate(raw)
+            data = parse_resume(raw)
             info("Loaded JSON. Refreshing UI...", self)
-            self._rebuild_repeater_from_widgets(self.education_rep)  # triggers rebuild
+            # Loading is an undoable step like any other edit
+            self._commit_snapshot()
+            self.history.push(data)
+            self._apply(self.history.current)
         except Exception as e:
             warn(f"Could not load JSON: {e}", self)
 
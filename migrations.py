@@ -0,0 +1,61 @@
+from __future__ import annotations
+from typing import Callable, Dict
+
+from models import ResumeData, SCHEMA_VERSION
+
+# Files written before schema_version existed
+UNVERSIONED = 0
+
+
+class MigrationError(ValueError):
+    pass
+
+
+_MIGRATIONS: Dict[int, Callable[[dict], dict]] = {}
+
+
+def migration(from_version: int):
+    """
+    Register a step that upgrades a raw resume dict from `from_version` to
+    `from_version + 1`. Steps work on plain dicts, before validation, so
+    they can still read fields the current models no longer have.
+    """
+    def register(fn: Callable[[dict], dict]) -> Callable[[dict], dict]:
+        if from_version in _MIGRATIONS:
+            raise ValueError(f"duplicate migration from version {from_version}")
+        _MIGRATIONS[from_version] = fn
+        return fn
+    return register
+
+
+@migration(UNVERSIONED)
+def _gpa_to_string(raw: dict) -> dict:
+    # Hand-written files sometimes stored the GPA as a number
+    for e in raw.get("education") or []:
+        if isinstance(e, dict) and isinstance(e.get("gpa"), (int, float)):
+            e["gpa"] = str(e["gpa"])
+    return raw
+
+
+def upgrade(raw: dict) -> dict:
+    """Apply registered steps until `raw` is at SCHEMA_VERSION (in place)."""
+    if not isinstance(raw, dict):
+        raise MigrationError(f"expected a JSON object, got {type(raw).__name__}")
+    version = raw.get("schema_version", UNVERSIONED)
+    if not isinstance(version, int):
+        raise MigrationError(f"invalid schema_version {version!r}")
+    if version > SCHEMA_VERSION:
+        raise MigrationError(f"schema_version {version} is newer than this app supports ({SCHEMA_VERSION})")
+    while version < SCHEMA_VERSION:
+        step = _MIGRATIONS.get(version)
+        if step is None:
+            raise MigrationError(f"no migration from schema_version {version}")
+        raw = step(raw)
+        version += 1
+        raw["schema_version"] = version
+    return raw
+
+
+def parse_resume(raw: dict) -> ResumeData:
+    """Upgrade then validate. Use this instead of ResumeData.model_validate on stored data."""
+    return ResumeData.model_validate(upgrade(raw))
@@ -2,6 +2,9 @@ from __future__ import annotations
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
+# Bump when a change to these models needs a step in migrations.py
+SCHEMA_VERSION = 1
+
 
 class PersonalInfo(BaseModel):
     full_name: str = ""
@@ -55,6 +58,8 @@ class AwardEntry(BaseModel):
 
 
 class ResumeData(BaseModel):
+    schema_version: int = SCHEMA_VERSION
+
     # Section headings (like your UI)
     section_personal: str = "Your Personal Info"
     section_education: str = "Education"
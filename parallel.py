@@ -0,0 +1,37 @@
+from __future__ import annotations
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional
+
+
+def chunks(items: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_ordered(fn: Callable[..., List], batches: Iterable[List], jobs: Optional[int], *args) -> Iterator:
+    """
+    Map `fn(batch, *args)` over batches in worker processes, yielding the
+    items of each returned list in input order while keeping only a few
+    batches in flight (streaming).
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        for batch in batches:
+            yield from fn(batch, *args)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(fn, batch, *args))
+            if len(pending) >= jobs * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -135,4 +135,16 @@ def build_fallback_pdf_reportlab(resume: ResumeData) -> bytes:
         out_path.unlink(missing_ok=True)
     except Exception:
         pass
-    return data
\ No newline at end of file
+    return data
+
+def build_pdf(resume: ResumeData, latex_src: Optional[str] = None) -> Tuple[bytes, str, str]:
+    """
+    Build a PDF with pdflatex, falling back to ReportLab.
+    Returns (pdf_bytes, engine, log) where engine is "pdflatex" or "reportlab".
+    """
+    if latex_src is None:
+        latex_src = render_latex(resume)
+    ok, pdf, log = try_build_pdf_with_pdflatex(latex_src)
+    if ok:
+        return (pdf, "pdflatex", log)
+    return (build_fallback_pdf_reportlab(resume), "reportlab", log)
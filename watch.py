@@ -0,0 +1,164 @@
+from __future__ import annotations
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from models import ResumeData
+from latex import render_latex
+from pdf_export import build_pdf
+from fileio import atomic_write_bytes, atomic_write_text
+from migrations import parse_resume
+
+STATE_FILE = ".resumaker-watch.json"
+# Seconds (on top of `settle`) before a failed render is retried
+RETRY_DELAY = 5.0
+
+
+class _FileState:
+    __slots__ = ("stat_key", "changed_at", "dirty", "raw_hash", "content_hash")
+
+    def __init__(self, content_hash: Optional[str] = None):
+        self.stat_key = None
+        self.changed_at = 0.0
+        self.dirty = False
+        self.raw_hash: Optional[str] = None
+        self.content_hash = content_hash  # hash of the last rendered ResumeData
+
+
+def content_hash(resume: ResumeData) -> str:
+    return hashlib.sha256(resume.model_dump_json().encode("utf-8")).hexdigest()
+
+
+class ResumeWatcher:
+    """
+    Polls a directory of resume JSON files and re-renders only the ones
+    whose content actually changed.
+
+    - mtime/size is just a cheap trigger; a file is re-rendered only when the
+      hash of its parsed ResumeData differs from the last render, so touches
+      and formatting-only saves are ignored.
+    - A file must be quiet for `settle` seconds before it is processed, which
+      coalesces bursts of saves (and skips half-written files).
+    - .tex/.pdf outputs are written atomically.
+    - A failed render is retried after RETRY_DELAY seconds.
+    - Rendered hashes are kept in OUT_DIR/.resumaker-watch.json so a restart
+      does not rebuild everything.
+    """
+    def __init__(
+        self,
+        src_dir,
+        out_dir=None,
+        settle: float = 0.5,
+        pdf: bool = True,
+        log: Callable[[str], None] = print,
+    ):
+        self.src_dir = Path(src_dir)
+        self.out_dir = Path(out_dir) if out_dir else self.src_dir
+        self.settle = settle
+        self.pdf = pdf
+        self.log = log
+        self._files: Dict[Path, _FileState] = {}
+        self._saved: Dict[str, str] = self._load_state()
+
+    # ---------- State ----------
+    def _state_path(self) -> Path:
+        return self.out_dir / STATE_FILE
+
+    def _load_state(self) -> Dict[str, str]:
+        try:
+            return json.loads(self._state_path().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        atomic_write_text(self._state_path(), json.dumps(self._saved, indent=2, sort_keys=True))
+
+    # ---------- Work ----------
+    def _render(self, src: Path, resume: ResumeData):
+        started = time.perf_counter()
+        latex_src = render_latex(resume)
+        atomic_write_text(self.out_dir / f"{src.stem}.tex", latex_src)
+        msg = f"{src.name}: wrote {src.stem}.tex"
+        if self.pdf:
+            pdf, engine, _ = build_pdf(resume, latex_src)
+            atomic_write_bytes(self.out_dir / f"{src.stem}.pdf", pdf)
+            msg += f" and {src.stem}.pdf ({engine})"
+        self.log(f"{msg} in {time.perf_counter() - started:.2f}s")
+
+    def _process(self, src: Path, state: _FileState) -> bool:
+        raw = src.read_bytes()
+        raw_hash = hashlib.sha256(raw).hexdigest()
+        if raw_hash == state.raw_hash:
+            return False
+        try:
+            resume = parse_resume(json.loads(raw))
+        except ValueError as e:
+            state.raw_hash = raw_hash
+            self.log(f"{src.name}: skipped, invalid resume JSON: {e}")
+            return False
+
+        digest = content_hash(resume)
+        if digest == state.content_hash and (self.out_dir / f"{src.stem}.tex").exists():
+            state.raw_hash = raw_hash
+            return False
+        # Hashes are only recorded once the render succeeded, so a failed
+        # render (disk full, permissions) is retried.
+        self._render(src, resume)
+        state.raw_hash = raw_hash
+        state.content_hash = digest
+        self._saved[src.name] = digest
+        return True
+
+    def poll(self, now: Optional[float] = None) -> List[Path]:
+        """Scan once; returns the files that were re-rendered."""
+        now = time.monotonic() if now is None else now
+        seen = set()
+        rendered: List[Path] = []
+
+        for src in sorted(self.src_dir.glob("*.json")):
+            if src.name.startswith("."):
+                continue  # our own state file, editor swap files
+            seen.add(src)
+            try:
+                st = src.stat()
+            except OSError:
+                continue
+            state = self._files.get(src)
+            if state is None:
+                state = self._files[src] = _FileState(self._saved.get(src.name))
+            key = (st.st_mtime_ns, st.st_size)
+            if key != state.stat_key:
+                state.stat_key = key
+                state.changed_at = now
+                state.dirty = True
+                continue  # wait for the file to settle
+            if state.dirty and now - state.changed_at >= self.settle:
+                state.dirty = False
+                try:
+                    if self._process(src, state):
+                        rendered.append(src)
+                except Exception as e:
+                    self.log(f"{src.name}: render failed: {type(e).__name__}: {e}")
+                    # Try again later even if the file is not touched
+                    state.dirty = True
+                    state.changed_at = now + RETRY_DELAY
+
+        for gone in [p for p in self._files if p not in seen]:
+            del self._files[gone]
+            self._saved.pop(gone.name, None)
+
+        if rendered:
+            self._save_state()
+        return rendered
+
+    def run(self, interval: float = 0.5):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.log(f"Watching {self.src_dir} -> {self.out_dir} (Ctrl+C to stop)")
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass